@@ -70,24 +70,41 @@ def get_files_list(which_dir: typing.Union[Path, str],
                    skips: typing.Optional[typing.Iterable[typing.Union[str, Path]]] = None
                    ) -> typing.Iterable[typing.Union[str, Path]]:
     """Get a complete list of all files and folders under WHICH_DIR, except those matching SKIPS.
-    Calls itself recursively, so it's a bad idea if the directory is (literally)
-    very profound.
+    Walks the tree once with os.walk(), following symlinks to directories. Subdirectories
+    whose paths match SKIPS are pruned from the walk before it descends into them; files
+    are filtered as they are found. A symlink that points back to one of the directories
+    it is in is listed but not followed, so link loops can't make the walk run forever.
+    The list is sorted once at the end.
     """
-    if skips is None:
-        skips = [][:]
+    skips = [str(the_skip) for the_skip in skips] if skips else [][:]
     ret = [][:]
-    for (thisdir, dirshere, fileshere) in os.walk(which_dir):
-        ret.append(os.path.join(thisdir))
-        if dirshere:
-            for dname in dirshere:
-                ret += get_files_list(os.path.join(thisdir, dname), skips)
-        if fileshere:
-            for fname in fileshere:
-                ret.append(os.path.join(thisdir, fname))
-        if skips:
-            for the_skip in skips:
-                ret = [the_item for the_item in ret if the_skip not in the_item]
-        ret.sort()
+    if any(the_skip in os.fspath(which_dir) for the_skip in skips):
+        return ret
+    root_real = os.path.realpath(which_dir)
+    real_paths, ancestors = {os.fspath(which_dir): root_real}, {os.fspath(which_dir): frozenset([root_real])}
+    for (thisdir, dirshere, fileshere) in os.walk(which_dir, followlinks=True):
+        ret.append(thisdir)
+        this_real, these_ancestors = real_paths.pop(thisdir), ancestors.pop(thisdir)
+        kept = [][:]
+        for d in dirshere:
+            the_path = os.path.join(thisdir, d)
+            if any(the_skip in the_path for the_skip in skips):
+                continue
+            if os.path.islink(the_path):
+                the_real = os.path.realpath(the_path)
+                if the_real in these_ancestors:     # Link loop: list it, but don't descend into it.
+                    ret.append(the_path)
+                    continue
+            else:
+                the_real = os.path.join(this_real, d)
+            real_paths[the_path], ancestors[the_path] = the_real, these_ancestors | {the_real}
+            kept.append(d)
+        dirshere[:] = kept
+        for fname in fileshere:
+            the_path = os.path.join(thisdir, fname)
+            if not any(the_skip in the_path for the_skip in skips):
+                ret.append(the_path)
+    ret.sort()
     return ret
 
 
@@ -26,13 +26,24 @@ from pprint import pprint
 import subprocess
 
 
+def _scripts():
+    """Return a list of the names of executable scripts ending in SH or sh in the
+    current directory. Scans the directory once, rather than globbing once for
+    each spelling of the extension and then deduplicating. "Executable" means
+    that the current user may execute the script, as os.access() reports it.
+    """
+    with os.scandir('.') as it:
+        return sorted([e.name for e in it if e.name.endswith(('SH', 'sh')) and not e.name.startswith('.')
+                       and e.is_file() and os.access(e.name, os.X_OK)])
+
+
 the_dirs = [ d for d in glob.glob("*") if os.path.isdir(d) ]
 for which_dir in the_dirs:
     olddir = os.getcwd()
     try:
         os.chdir(which_dir)
         print("changed directory to %s" % os.getcwd())
-        exec_scripts = [ which_script for which_script in list(set(glob.glob('*SH') + glob.glob('*sh'))) if os.access(which_script, os.X_OK) ]
+        exec_scripts = _scripts()
         pprint("exec_scripts are: %s" % exec_scripts)
         for which_script in exec_scripts:
             print("About to call script: %s" % which_script)
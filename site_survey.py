@@ -9,14 +9,20 @@ LICENSE.md for details.
 
 
 import bz2
+import concurrent.futures
 import datetime
 import html
+import os
+import pickle
 import requests
+import shutil
 import subprocess
+import threading
 import time
+import urllib.parse
 import uuid
 
-import file_utils as fu     # https://github.com/patrick-brian-mooney/personal-library/blob/master/
+import searcher             # https://github.com/patrick-brian-mooney/personal-library/blob/master/
 
 
 local_website_root = '/website-root'
@@ -25,35 +31,119 @@ survey_directory = '/~patrick/feeds/geographical-surveys/'
 
 remote_website_root = 'http://patrickbrianmooney.nfshost.com'
 IA_save_prefix = 'http://web.archive.org/save/'
+IA_workers = 4
+IA_pause = 3                # Minimum number of seconds between the starts of successive requests to the Archive.
+listing_cache_file = os.path.expanduser('~/.cache/site_survey_listing.pkl')
 
 skip_strings_list = ['.git', '.thumbnails', 'IF/']
+skip_strings_re = searcher.compile_skips(skip_strings_list)
 
 
 def tz_offset():
-    return abs(int(round((datetime.datetime.now() - datetime.datetime.utcnow()).total_seconds())) / 3600)
+    return abs(datetime.datetime.now().astimezone().utcoffset().total_seconds()) / 3600
+
+
+def cached_files_list(which_dir, skips=None):
+    """Get the same list that searcher.get_files_list_parallel() would return for
+    WHICH_DIR and SKIPS, but reuse the listing saved by the previous run if no
+    directory in the tree has changed since then.
+
+    A directory's mtime changes whenever anything is added to, removed from, or
+    renamed within it, so comparing the saved mtime of every directory against
+    a fresh stat() tells us whether the listing is still accurate, without
+    reading any of the directories themselves. A listing in which some directory
+    couldn't be read is not saved, because it would stay incomplete even after
+    that directory became readable again.
+    """
+    skip_re = searcher.compile_skips(skips)
+    skip_key = skip_re.pattern if skip_re else None
+    try:
+        with open(listing_cache_file, 'rb') as cache_file:
+            cache = pickle.load(cache_file)
+        if (cache['root'] == which_dir) and (cache['skips'] == skip_key):
+            if all(os.stat(d).st_mtime_ns == mtime for d, mtime in cache['dir_mtimes'].items()):
+                return cache['files']
+    except (OSError, EOFError, KeyError, pickle.UnpicklingError):
+        pass                    # No usable cache. Just rebuild it.
+
+    dir_mtimes = dict()             # Filled in as each directory is read, from a stat() taken just before reading it.
+    ret = searcher.get_files_list_parallel(which_dir, skip_re, dir_mtimes=dir_mtimes)
+    if None in dir_mtimes.values():
+        print('WARNING: some directories could not be read; not saving file listing cache.')
+        return ret
+    try:
+        os.makedirs(os.path.dirname(listing_cache_file), exist_ok=True)
+        with open(listing_cache_file, 'wb') as cache_file:
+            pickle.dump({'root': which_dir, 'skips': skip_key, 'dir_mtimes': dir_mtimes, 'files': ret},
+                        cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError as errrr:
+        print('WARNING: unable to save file listing cache! The system said: %s' % errrr)
+    return ret
 
 
 def IA_archive(files_list):
-    """Get the Internet Archive to save all of the files in FILES_LIST."""
-    for which_page in files_list:                                   # Request a URL that causes the Internet Archive to archive the page in question
+    """Get the Internet Archive to save all of the files in FILES_LIST.
+
+    Requests are made IA_workers at a time, but the workers share a single clock,
+    so requests are still started no more often than once every IA_pause seconds
+    overall; the concurrency only lets the Archive's slow responses overlap. The
+    response bodies, which can be whole images or PDFs, are never downloaded.
+    """
+    pause_lock = threading.Lock()
+    next_start = [time.monotonic()]
+
+    def wait_for_turn():                                            # Hold every worker to one request per IA_pause seconds, all told.
+        with pause_lock:
+            delay = next_start[0] - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            next_start[0] = time.monotonic() + IA_pause
+
+    def archive_page(which_page):                                   # Request a URL that causes the Internet Archive to archive the page in question
+        wait_for_turn()
         print('INFO: archiving %s' % which_page)
-        req = requests.get(IA_save_prefix + which_page)
-        for the_item in req.iter_content(chunk_size=100000): pass   # read the file to make the IArchive archive it.
-        time.sleep(3)
+        with requests.get(IA_save_prefix + which_page, stream=True):
+            pass                                                    # The save is triggered by the request itself; no need to download the body.
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=IA_workers) as executor:
+        list(executor.map(archive_page, files_list))
+
+
+def GPG_sign_files(files):
+    """Make a detached GPG signature for each file in FILES. gpg is run directly
+    rather than through a shell, so filenames are never re-parsed by the shell;
+    the running gpg-agent holds the unlocked key between files.
+    """
+    for which_file in files:
+        subprocess.run(['gpg', '--detach-sign', str(which_file)], check=True)
 
 
 def GPG_sign_file(which_file):
-    subprocess.check_output(['gpg --detach-sign %s' % which_file ], shell=True)
+    GPG_sign_files([which_file])
+
+
+def bzip2_compress(data):
+    """Compress DATA, a bytes object, into bzip2 format at the highest compression
+    level. Uses pbzip2, which compresses on all available cores at once, if it is
+    installed; otherwise, falls back on the single-threaded bz2 module.
+    """
+    pbzip2 = shutil.which('pbzip2')
+    if pbzip2:
+        return subprocess.run([pbzip2, '-9', '-c'], input=data, stdout=subprocess.PIPE, check=True).stdout
+    return bz2.compress(data, compresslevel=9)
 
 
 def produce_feed(files_list):
     """Produce the Atom XML feed."""
-    short_date = datetime.date.today().strftime('%d %B %Y')
-    ISO8601_date = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M:%S-0' + str(int(round(tz_offset()))) + ':00' )
-    two_digit_year = datetime.datetime.now().strftime('%y')
-    eight_digit_date = datetime.date.today().strftime('%Y%m%d')
-
-    the_feed = """<?xml version="1.0" encoding="utf-8"?>
+    now = datetime.datetime.now().astimezone()        # Ask the clock and the time zone database once, and derive everything from that.
+    short_date = now.strftime('%d %B %Y')
+    ISO8601_date = now.isoformat(timespec='seconds')
+    two_digit_year = now.strftime('%y')
+    eight_digit_date = now.strftime('%Y%m%d')
+    with open(description_file, encoding='utf-8') as the_description:
+        description = html.escape(the_description.read())
+
+    feed_parts = ["""<?xml version="1.0" encoding="utf-8"?>
 <feed xmlns="http://www.w3.org/2005/Atom">
 
   <title>Geographical Site Survey, %s: Patrick Brian Mooney's site</title>
@@ -75,21 +165,21 @@ def produce_feed(files_list):
     <title>Site Survey</title>
     <id>urn:uuid:%s</id>
     <updated>%s</updated>
-""" % (short_date, ISO8601_date, eight_digit_date, two_digit_year, uuid.uuid4(), short_date, uuid.uuid4(), ISO8601_date)
+""" % (short_date, ISO8601_date, eight_digit_date, two_digit_year, uuid.uuid4(), short_date, uuid.uuid4(), ISO8601_date)]
 
-    for the_file in files_list:
-        the_feed = the_feed + '    <link rel="related self" href="%s" />\n' % requests.utils.quote(the_file)
+    quote = urllib.parse.quote
+    feed_parts.extend('    <link rel="related self" href="%s" />\n' % quote(the_file, safe='/:') for the_file in files_list)
 
-    the_feed = the_feed + """    <content type="html">
-""" + html.escape(open(description_file).read())
+    feed_parts.append("""    <content type="html">
+""" + description)
 
-    the_feed = the_feed + """
+    feed_parts.append("""
     </content>
   </entry>
 
 </feed>
-"""
-    bzipped_feed = bz2.compress(the_feed.encode(), compresslevel=9)
+""")
+    bzipped_feed = bzip2_compress(''.join(feed_parts).encode('utf-8'))
     feed_location = '%s/%s.xml.bz2' % (survey_directory, eight_digit_date)
     with open(feed_location, 'wb') as the_atom_file:
         the_atom_file.write(bzipped_feed)
@@ -97,7 +187,7 @@ def produce_feed(files_list):
 
 
 if __name__ == "__main__":
-    local_files = fu.get_files_list(local_website_root, skip_strings_list)
+    local_files = cached_files_list(local_website_root, skip_strings_re)
     remote_files = [ the_item.replace(local_website_root, remote_website_root) for the_item in local_files ]
 
     produce_feed(remote_files)
@@ -13,11 +13,15 @@ LICENSE.md for details.
 """
 
 
+import functools
 import typing
+import weakref
 
 
 verbosity_level = 2
 
+_tumblr_user_info = weakref.WeakKeyDictionary()        # Tumblr client object -> its 'user/info' data
+
 
 def log_it(what, debug_level=1):
     """Convenience function to print optionally.
@@ -49,8 +53,15 @@ def tumblr_text_post(the_client: 'TumblrAPI',
 
     Returns two dictionaries: one contains a status code, the other contains more
     info.
+
+    The 'user/info' data is fetched only the first time a given client posts, and
+    is reused for later posts made through the same client.
     """
-    tumblr_data = the_client.post('user/info')
+    try:
+        tumblr_data = _tumblr_user_info[the_client]
+    except KeyError:
+        tumblr_data = the_client.post('user/info')
+        _tumblr_user_info[the_client] = tumblr_data
     tumblog_url = tumblr_data['user']['blogs'][0]['url']
     if tumblog_url.startswith('https://'):
         tumblog_url = 'http://' + tumblog_url[8:]
@@ -78,6 +89,19 @@ def get_new_twitter_API(client_credentials: dict) -> 'API':
     return ret
 
 
+@functools.lru_cache(maxsize=8)
+def _cached_twitter_API(consumer_key: str,
+                        consumer_secret: str,
+                        access_token: str,
+                        access_token_secret: str) -> 'API':
+    """Get a Tweepy API object for the given credentials, creating it only the first
+    time those credentials are seen, so that later calls reuse its HTTP session
+    (and its already-open connection to Twitter).
+    """
+    return get_new_twitter_API({'consumer_key': consumer_key, 'consumer_secret': consumer_secret,
+                                'access_token': access_token, 'access_token_secret': access_token_secret})
+
+
 def _the_API(client_credentials = None,
              API_instance = None):
     """Private convenience function to get an API instance object from several
@@ -87,7 +111,8 @@ def _the_API(client_credentials = None,
         if client_credentials is None:
             raise NotImplementedError("You must pass either client credentials or an already-initialized API instance")
         else:
-            API_instance = get_new_twitter_API(client_credentials)
+            API_instance = _cached_twitter_API(client_credentials['consumer_key'], client_credentials['consumer_secret'],
+                                               client_credentials['access_token'], client_credentials['access_token_secret'])
     return API_instance
 
 
@@ -96,7 +121,8 @@ def post_tweet(the_tweet: str,
                API_instance = None) -> typing.Type[object]:         # FIXME: better return type annotation!
     """Post a tweet, THE_TWEET. If you already have a Tweepy API instance handy
     pass that in as API_instance; otherwise, pass in a CLIENT_CREDENTIALS
-    dictionary and a throwaway API object will be created, then discarded.
+    dictionary and an API object will be created the first time those credentials
+    are used, then reused for later tweets.
     """
     return _the_API(client_credentials, API_instance).update_status(status=the_tweet)       # FIXME: annotate return type!
 
@@ -21,10 +21,34 @@ PARTICULAR PURPOSE. Use of this script is at your own risk.
 """
 
 
+import mmap
 import os
 import sys
 
 
+def copy_range(src, dst, offset, count):
+    """Copy COUNT bytes, starting at OFFSET, from the open file SRC to the open file
+    DST. Uses os.sendfile(), so that the data never has to pass through Python, if
+    the platform supports it; otherwise, falls back on an ordinary buffered copy.
+    """
+    try:
+        while count > 0:
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset, count)
+            if sent == 0:
+                break
+            offset, count = offset + sent, count - sent
+        return
+    except (AttributeError, OSError):       # No sendfile(), or not for these files.
+        pass
+    src.seek(offset)
+    while count > 0:
+        chunk = src.read(min(count, 1 << 20))
+        if not chunk:
+            break
+        dst.write(chunk)
+        count -= len(chunk)
+
+
 if __name__ == "__main__":
     if sys.argv[1] in ['-h', '--help']:
         print('\n')
@@ -34,16 +58,31 @@ if __name__ == "__main__":
         print('\nERROR: Wrong number of command-line parameters.\n')
         print(__doc__)
         sys.exit(1)
+    elif not sys.argv[2]:
+        print('\nERROR: The delimiter may not be empty.\n')
+        print(__doc__)
+        sys.exit(1)
 
     oldpath = os.getcwd()
     newpath, filename = os.path.split(sys.argv[1])
     if newpath: os.chdir(newpath)
 
-    with open(filename) as the_file:
-        file_contents = the_file.read()
-        new_files = file_contents.split(sys.argv[2])
-        for which_file in range(len(new_files)):
-            with open('%s-%04d' % (filename, which_file + 1), 'w') as this_file:
-                this_file.write(new_files[which_file])
+    # Find where every piece starts and ends by searching a memory map of the file,
+    # which leaves it to the kernel to page the file in, then have the kernel copy
+    # each piece straight into its own output file.
+    delimiter = sys.argv[2].encode()
+    with open(filename, 'rb') as the_file:
+        size = os.fstat(the_file.fileno()).st_size
+        pieces, start = [][:], 0
+        if size:                    # Can't mmap() an empty file.
+            with mmap.mmap(the_file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                while (end := mm.find(delimiter, start)) != -1:
+                    pieces.append((start, end))
+                    start = end + len(delimiter)
+        pieces.append((start, size))
+
+        for which_file, (start, end) in enumerate(pieces, 1):
+            with open('%s-%04d' % (filename, which_file), 'wb') as this_file:
+                copy_range(the_file, this_file, start, end - start)
 
     os.chdir(oldpath)
@@ -9,9 +9,11 @@ LICENSE.md for details.
 """
 
 
+import glob
 import os
 import shutil
 import subprocess
+import tarfile
 
 
 initial_tar_location = '/home/patrick/'
@@ -38,7 +40,7 @@ backup_file_list = [    '/etc/anacrontab',
                     ]
 
 
-backup_file_list = [f for f in backup_file_list if os.path.exists(f)]                   # Prune any non-existent entries in that list
+backup_file_list = [f for pattern in backup_file_list for f in glob.glob(os.path.expanduser(pattern))]   # Expand wildcards; drop non-existent entries
 
 
 commands_list = [   'crontab -l > %s/patrick.cronbak' % working_location,               # export user crontab
@@ -48,9 +50,33 @@ commands_list = [   'crontab -l > %s/patrick.cronbak' % working_location,
                  ]
 
 
+def report_walk_error(errrr):
+    print('    WARNING: unable to read %s! The system said: %s' % (errrr.filename, errrr))
+
+
+def archive_entries(which_file):
+    """Yield WHICH_FILE and, if it is a directory, everything under it, each parent
+    directory before its contents. Symlinks are yielded but never followed, as tar
+    does. A subdirectory that can't be read is reported and skipped, rather than
+    cutting short the rest of the tree.
+    """
+    yield which_file
+    if os.path.isdir(which_file) and not os.path.islink(which_file):
+        for (thisdir, dirshere, fileshere) in os.walk(which_file, onerror=report_walk_error):
+            for name in dirshere + fileshere:
+                yield os.path.join(thisdir, name)
+
+
 if __name__ == "__main__":
     for which_command in commands_list:
         subprocess.call(which_command, shell=True)
 
     # OK, create the archive
-    subprocess.call('tar -cvf %s/%s %s' % (initial_tar_location, backup_name,' '.join(backup_file_list)), shell=True)
+    with tarfile.open(os.path.join(initial_tar_location, backup_name), 'w') as the_archive:
+        for which_file in backup_file_list:
+            for which_path in archive_entries(which_file):          # One entry at a time, so one unreadable file doesn't lose the rest.
+                print(which_path)
+                try:
+                    the_archive.add(which_path, recursive=False)
+                except OSError as errrr:
+                    print('    WARNING: unable to add %s to the archive! The system said: %s' % (which_path, errrr))
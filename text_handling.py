@@ -8,6 +8,8 @@ LICENSE.md for details.
 """
 
 
+import functools
+import signal
 import sys
 import textwrap
 import shutil
@@ -15,6 +17,12 @@ import re
 from typing import Union
 
 
+_regex_metacharacters = frozenset('.^$*+?{}[]\\|()')
+_first_alphanumeric_re = re.compile(r'[^\W_]')                 # [^\W_] matches exactly what _is_alphanumeric_char() accepts.
+_last_alphanumeric_re = re.compile(r'.*[^\W_]', re.DOTALL)     # Greedy, so it backs up from the end to the last one.
+_alphanumeric_span_re = re.compile(r'[^\W_](?:.*[^\W_])?', re.DOTALL)     # From the first alphanumeric to the last one.
+
+
 def multi_replace(text, substitutions):
     """Modify TEXT and return the modified version by repeatedly replacing strings
     in SUBSTITUTIONS (a list of replacements, as specified below) until none of
@@ -25,6 +33,12 @@ def multi_replace(text, substitutions):
         subs = [['teh', 'the'],
                 ['chir', 'chair'],
                ]
+
+    Each search_string is a regular expression, and each replace_string may use
+    backreferences, just as with re.sub(). The patterns are compiled once, before
+    any substitutions are made, rather than looked up again on every pass. Pairs
+    that contain no regex syntax at all are handled with plain str.replace(),
+    which is much quicker.
     """
     debugging = False
     changed = True              # Be sure to run at least once.
@@ -32,11 +46,22 @@ def multi_replace(text, substitutions):
         from pprint import pprint
         print("substitutions are:")
         pprint(substitutions)
+    compiled = [(None if (_regex_metacharacters.isdisjoint(search) and '\\' not in replace) else re.compile(search), search, replace)
+                for search, replace in substitutions]
+
+    if len(compiled) == 1 and compiled[0][0] is None:       # Common case: one literal substitution. Another pass is needed
+        search, replace = compiled[0][1:]                   # exactly when the search string is still present, which is a
+        if search == replace:                               # much cheaper check than a whole substitution pass.
+            return text
+        while search in text:
+            text = text.replace(search, replace)
+        return text
+
     while changed:              # Repeatedly perform all substitutions until none of them change anything at all.
-        orig_text = text[:]
-        for which_replacement in substitutions:
-            if debugging: print("Processing substitution pattern %s    ->    %s" % (which_replacement[0], which_replacement[1]))
-            text = re.sub(which_replacement[0], which_replacement[1], text)
+        orig_text = text         # Strings are immutable; no copy needed to compare against later.
+        for pattern, search, replace in compiled:
+            if debugging: print("Processing substitution pattern %s    ->    %s" % (search, replace))
+            text = text.replace(search, replace) if pattern is None else pattern.sub(replace, text)
         changed = ( orig_text != text )
     return text
 
@@ -58,6 +83,27 @@ def _is_alphanumeric_char(c):
     return c.isalpha() or c.isnumeric()
 
 
+class _NonAlphanumericDropTable(dict):
+    """A translation table for str.translate() that deletes every character that
+    isn't alphanumeric (or, if ALLOW_SPACING is True, whitespace). Entries are
+    worked out the first time each character is seen, then remembered, so the
+    table only ever holds characters that have actually come up.
+    """
+    def __init__(self, allow_spacing):
+        dict.__init__(self)
+        self.allow_spacing = allow_spacing
+
+    def __missing__(self, codepoint):
+        c = chr(codepoint)
+        ret = codepoint if (_is_alphanumeric_char(c) or (self.allow_spacing and c.isspace())) else None
+        self[codepoint] = ret
+        return ret
+
+
+_drop_non_alphanumeric = _NonAlphanumericDropTable(allow_spacing=False)
+_drop_non_alphanumeric_or_spacing = _NonAlphanumericDropTable(allow_spacing=True)
+
+
 def is_alphanumeric(w):
     """Return True if the string W has only alphanumeric characters, or False if it
     contains anything else.
@@ -70,30 +116,26 @@ def strip_non_alphanumeric(w, also_allow_spacing=False):
     """Returns a string containing only the alphanumeric characters from string W (and,
     if also_allow_spacing is True, whitespace characters).
     """
-    if also_allow_spacing:
-        return "".join([ch for ch in w if _is_alphanumeric_char(ch) or ch.isspace()])
-    else:
-        return "".join([ch for ch in w if _is_alphanumeric_char(ch)])
+    return w.translate(_drop_non_alphanumeric_or_spacing if also_allow_spacing else _drop_non_alphanumeric)
 
 
 def _find_first_alphanumeric(w):
     """Returns the index of the first position in the string that is alphanumeric.
     If there are no alphanumeric characters in the string, returns -1
+
+    The scan is done by the regex engine, rather than character by character in
+    Python.
     """
-    for i, c in enumerate(w):
-        if _is_alphanumeric_char(c):
-            return i
-    return -1
+    m = _first_alphanumeric_re.search(w)
+    return m.start() if m else -1
 
 
 def _find_last_alphanumeric(w):
-    """Returns the index of the first position in the string that is alphanumeric.
+    """Returns the index of the last position in the string that is alphanumeric.
      If there are no alphanumeric characters in the string, returns -1
     """
-    for i, c in list(reversed(list(enumerate(w)))):
-        if c.isalpha() or c.isnumeric():
-            return i
-    return -1
+    m = _last_alphanumeric_re.match(w)
+    return m.end() - 1 if m else -1
 
 
 def strip_leading_and_trailing_punctuation(w):
@@ -101,7 +143,8 @@ def strip_leading_and_trailing_punctuation(w):
     filtered string. (Definition: here, "punctuation" includes whitespace and
     all other non-alphanumeric text.)
     """
-    return w[ _find_first_alphanumeric(w) : 1 + _find_last_alphanumeric(w) ]
+    m = _alphanumeric_span_re.search(w)
+    return m.group() if m else ''
 
 
 def is_capitalized(w):
@@ -113,6 +156,8 @@ def is_capitalized(w):
     ignores leading punctuation.
     """
     try:
+        if w[0].isalnum():      # Usually the case, and it saves searching.
+            return w[0].isupper()
         return w[_find_first_alphanumeric(w)].isupper()
     except IndexError:
         return False            # I hereby declare by fiat that zero-length strings are not capitalized.
@@ -126,6 +171,8 @@ def capitalize(w):
         return w
     elif len(w) == 1:
         return w.upper()
+    elif w[0].isalnum():        # Usually the case, and it saves searching.
+        return w[0].upper() + w[1:]
     else:
         first = _find_first_alphanumeric(w)
         if first == -1:
@@ -142,6 +189,8 @@ def decapitalize(w):
         return w
     elif len(w) == 1:
         return w.lower()
+    elif w[0].isalnum():
+        return w[0].lower() + w[1:]
     else:
         first = _find_first_alphanumeric(w)
         if first == -1:
@@ -153,16 +202,71 @@ def decapitalize(w):
 def terminal_width(default=80):
     """Do the best job possible of figuring out the width of the current terminal.
     Fall back on a default width if it cannot be determined.
+
+    Asks the terminal every time, unless the program has called
+    cache_terminal_width(), below.
     """
+    global _cached_width
+    if _cached_width is not None:
+        return _cached_width
     try:
         width = shutil.get_terminal_size()[0]
     except Exception:
-        width = default
+        return default
     if width == -1:
-        width = default
+        return default
+    if _width_is_cached:
+        _cached_width = width
     return width
 
 
+def _handle_SIGWINCH(signum, frame):
+    """Forget the cached terminal width when the terminal is resized, then pass the
+    signal along to whatever handler was installed before cache_terminal_width()
+    was called.
+    """
+    global _cached_width
+    _cached_width = None
+    if callable(_previous_SIGWINCH_handler):
+        _previous_SIGWINCH_handler(signum, frame)
+
+
+_width_is_cached, _cached_width, _previous_SIGWINCH_handler = False, None, None
+
+
+def cache_terminal_width():
+    """Have terminal_width() remember the terminal's width instead of asking the
+    terminal on every call, which is worthwhile for programs that print a great
+    deal of wrapped text. The remembered width is forgotten whenever the terminal
+    is resized.
+
+    To hear about resizes, this installs a SIGWINCH handler for the whole process,
+    so it is opt-in rather than done on import: curses, for one, only installs its
+    own resize handling if SIGWINCH is still at its default, so curses programs
+    should not call this. It must be called from the main thread. Returns True if
+    the width is now being cached, or False if that isn't possible here (e.g., on
+    Windows, which has no SIGWINCH).
+    """
+    global _width_is_cached, _previous_SIGWINCH_handler
+    if _width_is_cached:
+        return True
+    try:
+        _previous_SIGWINCH_handler = signal.signal(signal.SIGWINCH, _handle_SIGWINCH)
+    except (AttributeError, ValueError):    # No SIGWINCH on Windows, and only the main thread can install signal handlers.
+        return False
+    _width_is_cached = True
+    return True
+
+
+@functools.lru_cache(maxsize=16)
+def _wrapper_for_width(width):
+    """Get a textwrap.TextWrapper that wraps to WIDTH, creating it only the first time
+    it's asked for, instead of building a new one for every paragraph the way
+    textwrap.wrap() does.
+    """
+    return textwrap.TextWrapper(width=width, replace_whitespace=False, expand_tabs=False, drop_whitespace=False)
+
+
 def _get_wrapped_lines(paragraph, indent_width=0, enclosing_width=-1):
     """Function that splits the paragraph into lines. Mostly just wraps textwrap.wrap().
 
@@ -170,19 +274,22 @@ def _get_wrapped_lines(paragraph, indent_width=0, enclosing_width=-1):
     """
     if enclosing_width == -1:
         enclosing_width = terminal_width()
-    ret = textwrap.wrap(paragraph, width=enclosing_width - 2*indent_width, replace_whitespace=False, expand_tabs=False, drop_whitespace=False)
+    ret = _wrapper_for_width(enclosing_width - 2*indent_width).wrap(paragraph)
     return [ l.rstrip() for l in ret ]
 
 
 def print_indented(paragraph, each_side=4, extra_line_break_after_paragraph=True):
     """Print a paragraph with spacing on each side.
+
+    The wrapper is looked up once for the whole paragraph, and the output is
+    collected and written all at once, instead of with one print() per line.
     """
     paragraph = multi_replace(paragraph, [['\n\n', '\n']])
-    for p in paragraph.split('\n'):
-        lines = _get_wrapped_lines(p, each_side)
-        for l in lines:
-            l = ' ' * each_side + l.strip()
-            print(l)
+    wrapper = _wrapper_for_width(terminal_width() - 2*each_side)
+    indent = ' ' * each_side
+    lines = [indent + l.strip() for p in paragraph.split('\n') for l in wrapper.wrap(p)]
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
 
 
 def print_wrapped(paragraph):
@@ -191,16 +298,27 @@ def print_wrapped(paragraph):
     print_indented(paragraph, each_side=0)
 
 
+try:                                # Alas, the statistical likelihood is that this module is being run under Windows, so try that first.
+    import msvcrt
+except ImportError:                 # Under any non-Windows OS. (I hope.)
+    msvcrt = None
+    try:
+        import tty, termios
+    except ImportError:
+        tty, termios = None, None
+
+
 def getkey():
     """Do the best job possible of waiting for and grabbing a single keystroke.
     Borrowed from Zombie Apocalypse. Keep any changes in sync. (Sigh.)
+
+    Which method to use is worked out once, when the module is imported, rather
+    than by attempting imports on every keystroke.
     """
-    try:                            # Alas, the statistical likelihood is that this routine is being run under Windows, so try that first.
-        import msvcrt
+    if msvcrt:
         return msvcrt.getch()
-    except ImportError:             # Under any non-Windows OS. (I hope.)
+    if termios:
         try:
-            import tty, termios
             stdin_fd = sys.stdin.fileno()
             old_status = termios.tcgetattr(stdin_fd)
             try:
@@ -208,8 +326,9 @@ def getkey():
                 return sys.stdin.read(1)
             finally:
                 termios.tcsetattr(stdin_fd, termios.TCSADRAIN, old_status)
-        except:                     # If all else fails, fall back on this, though it may well return more than one keystroke's worth of data.
-            return input('')
+        except:
+            pass
+    return input('')                # If all else fails, fall back on this, though it may well return more than one keystroke's worth of data.
 
 
 def remove_prefix(line, prefix):
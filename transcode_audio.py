@@ -18,6 +18,10 @@ from typing import List, Type
 import music_file_handling as mfh
 
 
+_DOC_LINES = __doc__.strip().split('\n')
+_DESCRIPTION, _EPILOG = _DOC_LINES[0], _DOC_LINES[-1]
+
+
 def convert_files(filename: List[Type[Path]],
                   delete: bool,
                   mp4: bool,
@@ -47,8 +51,7 @@ def convert_files(filename: List[Type[Path]],
 
 
 def process_command_line(args: List[str]) -> None:
-    parser = argparse.ArgumentParser(prog='transcode_audio', description=__doc__.strip().split('\n')[0],
-                                     epilog=__doc__.strip().split('\n')[-1])
+    parser = argparse.ArgumentParser(prog='transcode_audio', description=_DESCRIPTION, epilog=_EPILOG)
 
     parser.add_argument('filename', type=Path, nargs='+')       # positional argument
     parser.add_argument('-4', '--mp4', '--m4a', '--to-mp4', '--to-m4a', action='store_true',
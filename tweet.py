@@ -20,12 +20,14 @@ import sys
 import social_media, social_media_auth  # https://github.com/patrick-brian-mooney/personal-library
 
 
+help_text = '\n\n' + __doc__ % sys.argv[0]
+
 if len(sys.argv) <= 1:
-    print('\n\n' + __doc__ % sys.argv[0])
+    print(help_text)
     sys.exit(2)
 
 if sys.argv[1] in ['-h', '--help']:
-    print('\n\n' + __doc__ % sys.argv[0])
+    print(help_text)
     sys.exit(0)
 
 if __name__ == "__main__":
@@ -22,6 +22,7 @@ from pathlib import Path
 
 import sys
 import subprocess
+import threading
 
 from typing import List
 
@@ -32,6 +33,18 @@ import text_handling as th
 WINEPREFIX = Path("~/.wine64/").expanduser().resolve()
 WINEARCH = "win64"
 WINEEXECPATH = Path("/usr/lib/wine/wine64").resolve()
+OUTPUT_TAIL_LINES = 4096        # How many lines of each output stream to keep for reporting if the program fails.
+
+
+def _tee(source, dest, tail) -> None:
+    """Copy each line from SOURCE, a pipe, to DEST as soon as it arrives, keeping
+    the most recent lines in TAIL, a bounded deque.
+    """
+    for line in iter(source.readline, b''):
+        dest.write(line)
+        dest.flush()
+        tail.append(line)
+    source.close()
 
 
 def main(args: List[str]) -> None:
@@ -43,19 +56,30 @@ def main(args: List[str]) -> None:
         sys.exit(0)
 
     cmdline = [f"{WINEEXECPATH}",] + args[1:]
-    env = collections.ChainMap({'WINEPREFIX': str(WINEPREFIX),
-                                'WINEARCH': WINEARCH},
-                               os.environ)
+    env = os.environ.copy()
+    env['WINEPREFIX'] = str(WINEPREFIX)
+    env['WINEARCH'] = WINEARCH
 
     print(f"Running under {sys.version}")
     print(f"Executing: {cmdline}")
 
-    proc = subprocess.run(cmdline, capture_output=True, env=env)
+    # Pass the program's output through as it's produced, rather than holding all of it in memory until the
+    # program exits; keep only the last part of each stream, in case we need to report on a failure.
+    stdout_tail, stderr_tail = collections.deque(maxlen=OUTPUT_TAIL_LINES), collections.deque(maxlen=OUTPUT_TAIL_LINES)
+    sys.stdout.flush()          # Our own buffered text has to go out before the program's output does.
+    proc = subprocess.Popen(cmdline, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+    tees = [threading.Thread(target=_tee, args=(proc.stdout, sys.stdout.buffer, stdout_tail)),
+            threading.Thread(target=_tee, args=(proc.stderr, sys.stderr.buffer, stderr_tail))]
+    for t in tees:
+        t.start()
+    for t in tees:
+        t.join()
+    proc.wait()
+
     if proc.returncode:
-        from pprint import pprint
         th.print_wrapped(th.unicode_of(f"Called process exit status {proc.returncode}"))
-        th.print_wrapped(th.unicode_of(f"Standard output:\n{proc.stdout}"))
-        th.print_wrapped(th.unicode_of(f"\nStandard error:\n{proc.stderr}\n\n"))
+        th.print_wrapped(f"Standard output (last {len(stdout_tail)} lines):\n{th.unicode_of(b''.join(stdout_tail))}")
+        th.print_wrapped(f"\nStandard error (last {len(stderr_tail)} lines):\n{th.unicode_of(b''.join(stderr_tail))}\n\n")
 
 
 if __name__ == "__main__":